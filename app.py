@@ -8,14 +8,35 @@ Author: Data Analyst Portfolio Project
 import streamlit as st
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+import pyarrow.parquet as pq
 import plotly.express as px
 import plotly.graph_objects as go
-import seaborn as sns
-import matplotlib.pyplot as plt
 from io import StringIO
+from collections import namedtuple
+import importlib.util
+import tempfile
+from functools import partial
+import uuid
+import weakref
 import warnings
 warnings.filterwarnings('ignore')
 
+# Copy-on-Write: copies are deferred until a frame is actually modified
+# (always on from pandas 3.0, opt-in on pandas 2.x)
+# Text columns are stored as Arrow strings instead of Python objects
+# (default from pandas 3.0, opt-in from pandas 2.1)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+    try:
+        pd.set_option('future.infer_string', True)
+    except pd.errors.OptionError:
+        pass
+
+# Optional fast Excel reader (pip install python-calamine, pandas >= 2.2)
+CALAMINE_AVAILABLE = importlib.util.find_spec('python_calamine') is not None
+
 # ==================== PAGE CONFIGURATION ====================
 st.set_page_config(
     page_title="Automated Data Analytics",
@@ -58,7 +79,46 @@ st.markdown("""
 
 # ==================== UTILITY FUNCTIONS ====================
 
-@st.cache_data
+# Strings read as missing values: the pandas C parser defaults (pandas.read_csv na_values)
+CSV_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+
+def read_csv_arrow(file):
+    """
+    Đọc CSV bằng parser đa luồng của PyArrow
+    
+    Raises:
+        ValueError: Nếu file không phải UTF-8 (PyArrow sẽ trả về cột binary)
+            hoặc có tên cột trùng nhau (PyArrow giữ nguyên, pandas đổi thành a, a.1)
+    """
+    # Same missing-value markers as the pandas C parser, in string columns too
+    convert_options = pa_csv.ConvertOptions(null_values=CSV_NA_VALUES, strings_can_be_null=True)
+    table = pa_csv.read_csv(file, convert_options=convert_options)
+    if any(pa.types.is_binary(field.type) for field in table.schema):
+        raise ValueError("CSV file is not valid UTF-8")
+    if len(set(table.column_names)) != table.num_columns:
+        raise ValueError("CSV file has duplicate column names")
+    
+    # All-empty columns are typed null by Arrow; pandas reads them as float64 NaN
+    if any(pa.types.is_null(field.type) for field in table.schema):
+        table = table.cast(pa.schema([
+            field.with_type(pa.float64()) if pa.types.is_null(field.type) else field
+            for field in table.schema
+        ]))
+    return table.to_pandas(date_as_object=False)
+
+
+def _uploaded_file_key(file):
+    """
+    Cache key cho file upload: định danh của lần upload thay vì toàn bộ nội dung
+    """
+    return (file.file_id, file.name, file.size)
+
+
+@st.cache_data(hash_funcs={'streamlit.runtime.uploaded_file_manager.UploadedFile': _uploaded_file_key})
 def load_data(file):
     """
     Load CSV or Excel file with error handling
@@ -71,41 +131,147 @@ def load_data(file):
     """
     try:
         if file.name.endswith('.csv'):
-            # Try different encodings
+            # Multithreaded PyArrow parser first, C parser as fallback
             try:
-                df = pd.read_csv(file, encoding='utf-8')
-            except UnicodeDecodeError:
-                df = pd.read_csv(file, encoding='latin-1')
+                df = read_csv_arrow(file)
+            except Exception:
+                # Try different encodings
+                try:
+                    file.seek(0)
+                    df = pd.read_csv(file, encoding='utf-8')
+                except UnicodeDecodeError:
+                    file.seek(0)
+                    df = pd.read_csv(file, encoding='latin-1')
         elif file.name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file)
+            # Rust-based calamine reader when installed, openpyxl/xlrd otherwise
+            df = None
+            if CALAMINE_AVAILABLE:
+                try:
+                    df = pd.read_excel(file, engine='calamine')
+                except Exception:
+                    file.seek(0)
+            if df is None:
+                df = pd.read_excel(file)
         else:
             st.error("❌ Định dạng file không được hỗ trợ. Vui lòng upload file CSV hoặc Excel.")
             return None
         
-        return df
+        return optimize_dtypes(df)
     except Exception as e:
         st.error(f"❌ Lỗi khi đọc file: {str(e)}")
         return None
 
 
+def _schema_key(df):
+    """
+    Cache key chỉ dựa trên tên cột và kiểu dữ liệu (không đọc nội dung)
+    """
+    return (tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes))
+
+
+# Content tokens of live DataFrames (id -> uuid); entries are dropped when the frame is collected
+_FRAME_TOKENS = {}
+
+
+def _frame_key(df):
+    """
+    Cache key O(1) cho DataFrame: một token gắn với chính object đó
+    
+    Các DataFrame trong app không bao giờ bị sửa tại chỗ (Copy-on-Write), nên
+    cùng object nghĩa là cùng nội dung. Token là uuid để không trùng giữa các
+    session, và bị xóa khi object bị thu hồi nên id() được tái sử dụng không
+    trả về kết quả cũ. Entry theo token đã bị xóa không bao giờ được dùng lại,
+    nên mọi cache dùng key này phải đặt max_entries.
+    """
+    key = id(df)
+    token = _FRAME_TOKENS.get(key)
+    if token is None:
+        token = _FRAME_TOKENS[key] = uuid.uuid4().hex
+        weakref.finalize(df, _FRAME_TOKENS.pop, key, None)
+    return token
+
+
+# dtype.kind characters belonging to each column group
+DTYPE_KIND_GROUPS = {
+    'numeric': 'iuf',
+    'categorical': 'OSU',
+    'datetime': 'M'
+}
+
+
+def _dtype_buckets(df):
+    """
+    Nhóm các cột theo loại dữ liệu bằng một lần duyệt qua df.dtypes
+
+    Thay cho nhiều lần gọi select_dtypes: mỗi dtype chỉ được đọc một lần
+    (dtype.kind), sau đó lọc cột bằng boolean mask của numpy.
+
+    Returns:
+        dict: {'numeric': pd.Index, 'categorical': pd.Index, 'datetime': pd.Index}
+    """
+    kinds = np.fromiter((dtype.kind for dtype in df.dtypes), dtype='U1', count=len(df.columns))
+    return {
+        group: df.columns[np.isin(kinds, list(chars))]
+        for group, chars in DTYPE_KIND_GROUPS.items()
+    }
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _schema_key})
 def analyze_column_types(df):
     """
     Phân tích và phân loại các cột trong dataframe
-    
+
+    Kết quả chỉ phụ thuộc vào schema nên được cache theo (tên cột, dtype),
+    các tab dùng chung một lần phân loại thay vì quét lại mỗi lần rerun.
+
     Returns:
         dict: Dictionary chứa các loại cột khác nhau
     """
-    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
+    return {group: cols.tolist() for group, cols in _dtype_buckets(df).items()}
+
+
+# Text columns with fewer unique values than this share of rows become 'category'
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def optimize_dtypes(df):
+    """
+    Thu nhỏ kiểu dữ liệu sau khi load để giảm bộ nhớ và tăng tốc các phép quét
     
-    return {
-        'numeric': numeric_cols,
-        'categorical': categorical_cols,
-        'datetime': datetime_cols
-    }
+    - Cột số nguyên: int64 -> int8/16/32 (không mất dữ liệu)
+    - Cột chữ có ít giá trị khác nhau -> category
+    
+    Returns:
+        pd.DataFrame: Dataframe với kiểu dữ liệu gọn hơn
+    """
+    df = df.copy(deep=False)
+    col_buckets = _dtype_buckets(df)
+    
+    # Floats stay float64: pandas only checks float32 downcasts with np.allclose,
+    # so 7.8 would come back as 7.800000190734863 in tables and exports
+    for col in col_buckets['numeric']:
+        if df[col].dtype.kind in 'iu':
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    for col in col_buckets['categorical']:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        # True/False object columns stay object: the 'boolean' dtype (kind 'b')
+        # would drop them from the categorical group used across the UI
+        if pd.api.types.infer_dtype(series, skipna=True) == 'boolean':
+            continue
+        if len(series) > 0 and series.nunique() / len(series) < CATEGORY_MAX_UNIQUE_RATIO:
+            df[col] = series.astype('category')
+    
+    return df
+
+
+# Number of non-null values probed before converting a text column to numeric
+TYPE_PROBE_SAMPLE_SIZE = 1000
 
 
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _frame_key})
 def clean_data(df, remove_duplicates=True, handle_missing='drop', convert_types=True):
     """
     Smart data cleaning function with enhanced categorical support
@@ -120,7 +286,8 @@ def clean_data(df, remove_duplicates=True, handle_missing='drop', convert_types=
         pd.DataFrame: Cleaned dataframe
         dict: Cleaning statistics with warnings
     """
-    df_cleaned = df.copy()
+    # Shallow copy: with Copy-on-Write the data is only copied if modified
+    df_cleaned = df.copy(deep=False)
     stats = {
         'original_rows': len(df),
         'original_cols': len(df.columns),
@@ -129,12 +296,16 @@ def clean_data(df, remove_duplicates=True, handle_missing='drop', convert_types=
         'types_converted': 0,
         'warnings': []
     }
+    col_buckets = _dtype_buckets(df_cleaned)
     
     # 1. Remove duplicates
     if remove_duplicates:
-        before = len(df_cleaned)
-        df_cleaned = df_cleaned.drop_duplicates()
-        stats['duplicates_removed'] = before - len(df_cleaned)
+        # Probe first: no new frame is built when there is nothing to drop
+        dup_mask = df_cleaned.duplicated(keep='first')
+        n_duplicates = int(dup_mask.sum())
+        if n_duplicates:
+            df_cleaned = df_cleaned.loc[~dup_mask]
+        stats['duplicates_removed'] = n_duplicates
     
     # 2. Handle missing values
     if handle_missing == 'drop':
@@ -142,41 +313,29 @@ def clean_data(df, remove_duplicates=True, handle_missing='drop', convert_types=
         df_cleaned = df_cleaned.dropna()
         stats['missing_handled'] = before - len(df_cleaned)
     
-    elif handle_missing == 'fill_mean':
-        # Only apply to numeric columns
-        numeric_cols = df_cleaned.select_dtypes(include=['int64', 'float64']).columns
-        categorical_cols_with_nulls = df_cleaned.select_dtypes(include=['object', 'category']).columns[
-            df_cleaned.select_dtypes(include=['object', 'category']).isnull().any()
-        ].tolist()
+    elif handle_missing in ('fill_mean', 'fill_median'):
+        # One null scan shared by the numeric fill and the categorical warning
+        has_nulls = df_cleaned.isnull().any()
+        numeric_cols = col_buckets['numeric']
+        categorical_cols = col_buckets['categorical']
         
-        for col in numeric_cols:
-            if df_cleaned[col].isnull().any():
-                df_cleaned[col].fillna(df_cleaned[col].mean(), inplace=True)
-                stats['missing_handled'] += 1
-        
-        # Warning for categorical columns
-        if categorical_cols_with_nulls:
-            stats['warnings'].append(
-                f"⚠️ Phương pháp 'Mean' không áp dụng cho cột dạng chữ: {', '.join(categorical_cols_with_nulls)}. "
-                f"Các cột này vẫn còn giá trị thiếu."
-            )
-    
-    elif handle_missing == 'fill_median':
         # Only apply to numeric columns
-        numeric_cols = df_cleaned.select_dtypes(include=['int64', 'float64']).columns
-        categorical_cols_with_nulls = df_cleaned.select_dtypes(include=['object', 'category']).columns[
-            df_cleaned.select_dtypes(include=['object', 'category']).isnull().any()
-        ].tolist()
-        
-        for col in numeric_cols:
-            if df_cleaned[col].isnull().any():
-                df_cleaned[col].fillna(df_cleaned[col].median(), inplace=True)
-                stats['missing_handled'] += 1
+        # One vectorized fillna(dict) instead of a per-column inplace fill
+        cols_to_fill = numeric_cols[has_nulls[numeric_cols].to_numpy()]
+        if len(cols_to_fill) > 0:
+            if handle_missing == 'fill_mean':
+                fill_values = df_cleaned[cols_to_fill].mean().to_dict()
+            else:
+                fill_values = df_cleaned[cols_to_fill].median().to_dict()
+            df_cleaned = df_cleaned.fillna(value=fill_values)
+            stats['missing_handled'] += len(cols_to_fill)
         
         # Warning for categorical columns
+        categorical_cols_with_nulls = categorical_cols[has_nulls[categorical_cols].to_numpy()].tolist()
         if categorical_cols_with_nulls:
+            method_label = 'Mean' if handle_missing == 'fill_mean' else 'Median'
             stats['warnings'].append(
-                f"⚠️ Phương pháp 'Median' không áp dụng cho cột dạng chữ: {', '.join(categorical_cols_with_nulls)}. "
+                f"⚠️ Phương pháp '{method_label}' không áp dụng cho cột dạng chữ: {', '.join(categorical_cols_with_nulls)}. "
                 f"Các cột này vẫn còn giá trị thiếu."
             )
     
@@ -185,30 +344,64 @@ def clean_data(df, remove_duplicates=True, handle_missing='drop', convert_types=
         numeric_filled = 0
         categorical_filled = 0
         
-        for col in df_cleaned.columns:
-            if df_cleaned[col].isnull().any():
-                mode_val = df_cleaned[col].mode()
-                if not mode_val.empty:
-                    df_cleaned[col].fillna(mode_val[0], inplace=True)
-                    stats['missing_handled'] += 1
-                    
-                    # Track what type of column was filled
-                    if df_cleaned[col].dtype in ['int64', 'float64']:
-                        numeric_filled += 1
-                    else:
-                        categorical_filled += 1
+        # Modes of every column with nulls in one DataFrame.mode call;
+        # all-null columns have no mode (NaN in the first row) and are skipped
+        fill_values = {}
+        cols_with_nulls = df_cleaned.columns[df_cleaned.isnull().any().to_numpy()]
+        if len(cols_with_nulls) > 0:
+            modes = df_cleaned[cols_with_nulls].mode(dropna=True)
+            if not modes.empty:
+                fill_values = modes.iloc[0].dropna().to_dict()
+        
+        # One vectorized fillna(dict) instead of a per-column inplace fill
+        if fill_values:
+            df_cleaned = df_cleaned.fillna(value=fill_values)
+            stats['missing_handled'] += len(fill_values)
+            
+            # Track what type of column was filled
+            for col in fill_values:
+                if col in col_buckets['numeric']:
+                    numeric_filled += 1
+                else:
+                    categorical_filled += 1
         
         if categorical_filled > 0:
             stats['warnings'].append(
                 f"ℹ️ Đã điền {categorical_filled} cột dạng chữ và {numeric_filled} cột số bằng giá trị phổ biến nhất (Mode)."
             )
     
+    # Category columns keep the categories of dropped rows; without this
+    # value_counts (bar charts) would list them with a count of 0
+    if len(df_cleaned) < len(df):
+        for col in col_buckets['categorical']:
+            if isinstance(df_cleaned[col].dtype, pd.CategoricalDtype):
+                df_cleaned[col] = df_cleaned[col].cat.remove_unused_categories()
+    
     # 3. Auto convert data types (detect numeric columns stored as strings)
     if convert_types:
-        for col in df_cleaned.select_dtypes(include=['object']).columns:
+        # Category columns are included: optimize_dtypes may have turned
+        # low-cardinality numeric strings into categories on load
+        for col in col_buckets['categorical']:
             # Try to convert to numeric
             try:
-                converted = pd.to_numeric(df_cleaned[col], errors='coerce')
+                # Cheap probe on the first non-null values: skip obvious text
+                # columns before paying for the full-column conversion
+                sample = df_cleaned[col].dropna().head(TYPE_PROBE_SAMPLE_SIZE)
+                sample_parsed = pd.to_numeric(sample, errors='coerce').notna()
+                if sample_parsed.mean() <= 0.8:
+                    continue
+                
+                # Sample parsed cleanly: try the strict parser first (no NaN
+                # coercion pass), fall back to coerce on the first bad value
+                converted = None
+                if sample_parsed.all():
+                    try:
+                        converted = pd.to_numeric(df_cleaned[col], errors='raise')
+                    except (ValueError, TypeError):
+                        converted = None
+                if converted is None:
+                    converted = pd.to_numeric(df_cleaned[col], errors='coerce')
+                
                 # If more than 80% can be converted, it's probably numeric
                 if converted.notna().sum() / len(df_cleaned) > 0.8:
                     df_cleaned[col] = converted
@@ -222,53 +415,288 @@ def clean_data(df, remove_duplicates=True, handle_missing='drop', convert_types=
     return df_cleaned, stats
 
 
-def detect_outliers(df, column, method='iqr'):
+def numeric_values(series):
+    """
+    Lấy giá trị cột số dưới dạng mảng float numpy (NaN cho giá trị thiếu)
+    
+    Giữ float32 khi không mất độ chính xác (cột float32, số nguyên <= 16 bit)
+    để các lượt quét quantile/mask chỉ đọc một nửa lượng bộ nhớ.
+    """
+    dtype = series.dtype
+    if (dtype.kind == 'f' and dtype.itemsize <= 4) or (dtype.kind in 'iu' and dtype.itemsize <= 2):
+        return series.to_numpy(dtype=np.float32, na_value=np.nan)
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def column_quartiles(df):
+    """
+    Tính (Q1, median, Q3) cho tất cả cột số trong một lần np.nanquantile
+    
+    Gọi một lần khi dữ liệu được tải/làm sạch; chọn cột khác trong tab
+    outliers sau đó chỉ là tra dict.
+    
+    Returns:
+        dict: {column: (Q1, median, Q3)}
+    """
+    numeric_cols = _dtype_buckets(df)['numeric']
+    if len(numeric_cols) == 0:
+        return {}
+    
+    arr = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    qs = np.nanquantile(arr, [0.25, 0.5, 0.75], axis=0)
+    return {col: tuple(qs[:, i]) for i, col in enumerate(numeric_cols)}
+
+
+def partition_quantiles(values, qs):
+    """
+    Quantile nội suy tuyến tính (giống hệt np.quantile mặc định) bằng np.partition tại chỗ
+    
+    Chỉ các phần tử ở vị trí floor/ceil của mỗi quantile được chọn (introselect,
+    O(N)) ngay trên mảng đầu vào, không tạo bản sao như np.quantile.
+    
+    Args:
+        values: np.ndarray float32/float64 không chứa NaN (bị sắp xếp lại tại chỗ)
+        qs: Danh sách quantile trong [0, 1]
+    
+    Returns:
+        np.ndarray: Giá trị quantile (float64)
+    """
+    n = values.size
+    positions = np.asarray(qs, dtype=np.float64) * (n - 1)
+    lo = np.floor(positions).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    values.partition(np.unique(np.concatenate([lo, hi])))
+    
+    # Same lerp as numpy's 'linear' method so results match np.quantile exactly
+    below, above = values[lo], values[hi]
+    t = positions - lo
+    diff = above - below
+    return np.where(t >= 0.5, above - diff * (1 - t), below + diff * t)
+
+
+def iqr_bounds(values, quartiles=None):
+    """
+    Tính Q1, Q3, IQR và ngưỡng outlier (1.5 * IQR) trên mảng numpy
+    
+    Args:
+        values: np.ndarray float32/float64 không chứa NaN (có thể bị sắp xếp lại);
+            không dùng đến (có thể là None) khi đã có quartiles
+        quartiles: (Q1, median, Q3) đã tính sẵn (column_quartiles), nếu có
+    
+    Returns:
+        tuple: (Q1, median, Q3, IQR, lower_bound, upper_bound)
+    """
+    if quartiles is None:
+        # Quartiles and median from a single in-place partition
+        quartiles = partition_quantiles(values, [0.25, 0.5, 0.75])
+    
+    # Thresholds are always float64
+    Q1, median, Q3 = np.asarray(quartiles, dtype=np.float64)
+    IQR = Q3 - Q1
+    return Q1, median, Q3, IQR, Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+
+
+def outlier_mask(values, lower_bound, upper_bound):
+    """
+    Đánh dấu các giá trị nằm ngoài [lower_bound, upper_bound]
+    
+    NaN so sánh False ở cả hai phía nên không bao giờ là outlier.
+    
+    Returns:
+        np.ndarray: Boolean mask
+    """
+    # In-place OR: one result array plus one temporary instead of three arrays
+    mask = values < lower_bound
+    mask |= values > upper_bound
+    return mask
+
+
+def find_outliers(df, column, method='iqr', quartiles=None):
     """
-    Detect outliers using IQR method
+    Tìm vị trí các dòng outlier (phương pháp IQR) mà không tạo dataframe kết quả
     
     Args:
         df: Input dataframe
         column: Column name to check for outliers
         method: Detection method (currently supports 'iqr')
+        quartiles: Precomputed (Q1, median, Q3) for the column, optional
     
     Returns:
-        pd.DataFrame: Dataframe with outlier information
+        np.ndarray: Vị trí (iloc) các dòng outlier
         dict: Outlier statistics
     """
-    if column not in df.columns or df[column].dtype not in ['int64', 'float64']:
+    if column not in df.columns or df[column].dtype.kind not in DTYPE_KIND_GROUPS['numeric']:
         return None, None
     
-    data = df[column].dropna()
+    # Work on a plain float ndarray (NaN for missing) instead of Series copies
+    values = numeric_values(df[column])
+    valid = ~np.isnan(values)
+    total_values = int(valid.sum())
+    
+    if total_values == 0:
+        return None, None
     
     if method == 'iqr':
-        Q1 = data.quantile(0.25)
-        Q3 = data.quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        outliers_mask = (df[column] < lower_bound) | (df[column] > upper_bound)
-        outliers_df = df[outliers_mask].copy()
-        outliers_df['outlier_reason'] = outliers_df[column].apply(
-            lambda x: f"Below {lower_bound:.2f}" if x < lower_bound else f"Above {upper_bound:.2f}"
-        )
+        # The NaN-free copy is only needed when the quartiles are computed here
+        valid_values = values[valid] if quartiles is None else None
+        Q1, median, Q3, IQR, lower_bound, upper_bound = iqr_bounds(valid_values, quartiles)
+        
+        outliers_mask = outlier_mask(values, lower_bound, upper_bound)
+        outlier_positions = np.flatnonzero(outliers_mask)
+        
+        # Whisker ends = most extreme non-outlier values (same as px.box)
+        inliers = valid & ~outliers_mask
+        lower_whisker = float(values.min(where=inliers, initial=np.inf))
+        upper_whisker = float(values.max(where=inliers, initial=-np.inf))
         
         stats = {
-            'total_values': len(data),
-            'outliers_count': len(outliers_df),
-            'outliers_percentage': (len(outliers_df) / len(data)) * 100,
+            'total_values': total_values,
+            'outliers_count': len(outlier_positions),
+            'outliers_percentage': (len(outlier_positions) / total_values) * 100,
             'lower_bound': lower_bound,
             'upper_bound': upper_bound,
             'Q1': Q1,
             'Q3': Q3,
-            'IQR': IQR
+            'IQR': IQR,
+            'median': median,
+            'lower_whisker': lower_whisker,
+            'upper_whisker': upper_whisker
         }
         
-        return outliers_df, stats
+        return outlier_positions, stats
     
     return None, None
 
 
+def outlier_rows(df, column, positions, stats):
+    """
+    Lấy các dòng outlier theo vị trí kèm cột outlier_reason
+    
+    Returns:
+        pd.DataFrame: Các dòng outlier
+    """
+    # Positional take, no boolean-indexer alignment; iloc already returns
+    # a new frame (Copy-on-Write) so no extra .copy() is needed
+    outliers_df = df.iloc[positions]
+    outliers_df['outlier_reason'] = np.where(
+        numeric_values(outliers_df[column]) < stats['lower_bound'],
+        f"Below {stats['lower_bound']:.2f}",
+        f"Above {stats['upper_bound']:.2f}"
+    )
+    return outliers_df
+
+
+def new_df_version():
+    """
+    Token định danh nội dung df_work, đổi mỗi khi df_original/df_cleaned được gán lại
+    
+    Dùng uuid thay cho bộ đếm vì cache của Streamlit dùng chung giữa các session.
+    """
+    return uuid.uuid4().hex
+
+
+OUTLIER_PAGE_SIZE = 1000
+
+def format_outlier_stats(stats):
+    """
+    Chuỗi hiển thị cho các chỉ số outlier
+    
+    Returns:
+        dict: {key của stats: chuỗi đã định dạng}
+    """
+    return {
+        'total_values': f"{stats['total_values']:,}",
+        'outliers_count': f"{stats['outliers_count']:,}",
+        'outliers_percentage': f"{stats['outliers_percentage']:.2f}%",
+        'Q1': f"Q1 (25%): {stats['Q1']:.2f}",
+        'Q3': f"Q3 (75%): {stats['Q3']:.2f}",
+        'IQR': f"IQR: {stats['IQR']:.2f}",
+        'lower_bound': f"Lower Bound: {stats['lower_bound']:.2f}",
+        'upper_bound': f"Upper Bound: {stats['upper_bound']:.2f}"
+    }
+
+
+# Cached outlier result: total count, row positions, all outlier values, IQR stats
+# and their display strings
+OutlierResult = namedtuple('OutlierResult', ['count', 'positions', 'values', 'stats', 'text'])
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def outlier_analysis(_df, df_version, column, quartiles=None):
+    """
+    find_outliers được cache theo (df_version, column)
+    
+    _df không được hash (tiền tố '_'), nên rerun do widget khác chỉ tốn
+    một lần tra cache thay vì hash cả DataFrame và tính lại quantile.
+    Cache chỉ giữ vị trí các dòng outlier; mỗi trang bảng được lấy bằng
+    outlier_rows trên đúng số dòng cần hiển thị.
+    
+    Returns:
+        OutlierResult hoặc None nếu cột không phân tích được
+    """
+    positions, stats = find_outliers(_df, column, quartiles=quartiles)
+    if stats is None:
+        return None
+    
+    return OutlierResult(
+        count=stats['outliers_count'],
+        positions=positions,
+        values=numeric_values(_df[column].iloc[positions]),
+        stats=stats,
+        text=format_outlier_stats(stats)
+    )
+
+
+def show_more_outliers():
+    """Callback nút "Xem thêm": hiển thị thêm một trang outliers"""
+    st.session_state.outlier_page_size = st.session_state.get('outlier_page_size', OUTLIER_PAGE_SIZE) + OUTLIER_PAGE_SIZE
+
+
+# Fixed-size, non-interactive outlier boxplot: no container-resize relayouts or
+# hover/zoom handlers in the browser (the outliers are listed in the table below)
+BOXPLOT_WIDTH = 900
+BOXPLOT_HEIGHT = 450
+BOXPLOT_CONFIG = {'staticPlot': True}
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def create_outlier_boxplot(df_version, column, _stats, _outlier_values):
+    """
+    Vẽ box plot từ thống kê đã tính sẵn (Q1, median, Q3, whisker) và các điểm outlier
+    
+    Chỉ gửi O(1) số liệu tóm tắt + K outlier xuống trình duyệt thay vì cả cột.
+    Được cache theo (df_version, column): stats và outlier_values được suy ra
+    từ hai giá trị này nên không cần hash.
+    
+    Args:
+        df_version: Token nội dung của df_work
+        column: Tên cột
+        _stats: Dict thống kê từ find_outliers
+        _outlier_values: Giá trị các outlier
+    
+    Returns:
+        dict: Plotly figure dạng dict (truyền thẳng cho st.plotly_chart)
+    """
+    fig = go.Figure(go.Box(
+        name=column,
+        q1=[_stats['Q1']],
+        median=[_stats['median']],
+        q3=[_stats['Q3']],
+        lowerfence=[_stats['lower_whisker']],
+        upperfence=[_stats['upper_whisker']],
+        y=[np.asarray(_outlier_values).tolist()],
+        boxpoints='outliers'
+    ))
+    fig.update_layout(
+        title=f"Box Plot - {column}",
+        template='plotly_white',
+        width=BOXPLOT_WIDTH,
+        height=BOXPLOT_HEIGHT,
+        margin=dict(l=40, r=10, t=50, b=30)
+    )
+    return fig.to_dict()
+
+
 def suggest_chart_type(x_col, y_col, df):
     """
     Gợi ý loại biểu đồ phù hợp dựa trên kiểu dữ liệu
@@ -299,19 +727,34 @@ def suggest_chart_type(x_col, y_col, df):
             return 'bar'
 
 
+# Scatter plots above this many rows are drawn from a random sample
+SCATTER_MAX_POINTS = 20_000
+
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={pd.DataFrame: _frame_key})
 def create_visualization(df, chart_type, x_col, y_col=None, color_col=None):
     """
     Tạo biểu đồ tương tác với Plotly
     
+    Figure được cache theo (dữ liệu, loại biểu đồ, các cột đã chọn).
+    
     Returns:
         plotly.graph_objects.Figure: Interactive chart
     """
     try:
         if chart_type == 'scatter':
-            fig = px.scatter(df, x=x_col, y=y_col, color=color_col,
-                           title=f"{y_col} vs {x_col}",
-                           template='plotly_white',
-                           hover_data=df.columns)
+            # Large frames are plotted from a fixed random sample to keep the payload small
+            title = f"{y_col} vs {x_col}"
+            df_plot = df
+            if len(df) > SCATTER_MAX_POINTS:
+                df_plot = df.sample(n=SCATTER_MAX_POINTS, random_state=0)
+                title += f" (mẫu {SCATTER_MAX_POINTS:,} / {len(df):,} điểm)"
+            
+            # Hover shows x/y/color only: hover_data=df.columns would embed
+            # every column of every point in the figure JSON
+            fig = px.scatter(df_plot, x=x_col, y=y_col, color=color_col,
+                           title=title,
+                           template='plotly_white')
         elif chart_type == 'bar':
             if y_col:
                 fig = px.bar(df, x=x_col, y=y_col, color=color_col,
@@ -350,6 +793,26 @@ def create_visualization(df, chart_type, x_col, y_col=None, color_col=None):
         return None
 
 
+def compute_correlation_matrix(numeric_df):
+    """
+    Ma trận tương quan Pearson cho các cột numeric
+    
+    Khi không có giá trị thiếu, dùng np.corrcoef (BLAS) thay vì DataFrame.corr
+    vốn phải xử lý NaN theo từng cặp cột; kết quả giống nhau.
+    
+    Returns:
+        pd.DataFrame: Correlation matrix
+    """
+    values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    if np.isnan(values).any():
+        return numeric_df.corr()
+    
+    corr = np.corrcoef(values, rowvar=False)
+    return pd.DataFrame(corr, index=numeric_df.columns, columns=numeric_df.columns)
+
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _frame_key})
 def create_correlation_heatmap(df):
     """
     Tạo correlation heatmap cho các cột numeric
@@ -357,13 +820,14 @@ def create_correlation_heatmap(df):
     Returns:
         plotly.graph_objects.Figure: Heatmap
     """
-    numeric_df = df.select_dtypes(include=['int64', 'float64'])
+    numeric_df = df[_dtype_buckets(df)['numeric']]
     
     if len(numeric_df.columns) < 2:
         return None
     
-    corr_matrix = numeric_df.corr()
+    corr_matrix = compute_correlation_matrix(numeric_df)
     
+    # text_auto is rendered client-side via texttemplate (no per-cell formatting in Python)
     fig = px.imshow(corr_matrix,
                     text_auto='.2f',
                     aspect='auto',
@@ -376,11 +840,135 @@ def create_correlation_heatmap(df):
     return fig
 
 
+@st.cache_data(show_spinner=False)
+def missing_summary(missing_per_col, n_rows):
+    """
+    Bảng chi tiết giá trị thiếu theo cột (chỉ các cột có giá trị thiếu)
+    
+    Args:
+        missing_per_col: pd.Series số giá trị thiếu mỗi cột (df.isna().sum())
+        n_rows: Số dòng của dataframe
+    
+    Returns:
+        pd.DataFrame: Column, Missing Count, Missing % (giảm dần theo số lượng)
+    """
+    missing = missing_per_col[missing_per_col > 0]
+    return pd.DataFrame({
+        'Column': missing.index,
+        'Missing Count': missing.values,
+        'Missing %': (missing.values / n_rows * 100).round(2)
+    }).sort_values('Missing Count', ascending=False)
+
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _frame_key})
+def compute_overview(df):
+    """
+    Tính các thông tin tổng quan tốn kém cho tab 1 (describe, info, bộ nhớ)
+    
+    Returns:
+        dict: {'describe': pd.DataFrame, 'info': str, 'memory_mb': float}
+    """
+    buffer = StringIO()
+    df.info(buf=buffer)
+    
+    return {
+        'describe': df.describe(),
+        'info': buffer.getvalue(),
+        'memory_mb': df.memory_usage(deep=True).sum() / 1024**2
+    }
+
+
+# Rows serialized per step when exporting CSV
+EXPORT_CHUNK_ROWS = 100_000
+# CSV exports larger than this are spooled to a temporary file while being written
+EXPORT_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_key})
 def convert_df_to_csv(df):
     """
     Convert dataframe to CSV for download
+    
+    Cached so reruns do not re-serialize unchanged data (original + cleaned,
+    a few entries at most to bound memory).
+    
+    Dùng CSV writer đa luồng (C++) của PyArrow; quay về pandas to_csv nếu
+    dữ liệu không chuyển được sang Arrow (vd: cột object lẫn nhiều kiểu).
+    Cột ngày giờ và boolean được định dạng như to_csv (astype('string')) trước
+    khi ghi. Khác biệt còn lại so với to_csv: chuỗi được đặt trong dấu nháy,
+    và số thực nguyên không có phần thập phân (1.0 -> 1, nên đọc lại sẽ
+    thành cột int64).
+    Dữ liệu được ghi theo từng khối EXPORT_CHUNK_ROWS dòng vào file tạm
+    (tràn ra đĩa khi lớn) nên không tạo bản sao Arrow/chuỗi của cả bảng.
     """
-    return df.to_csv(index=False).encode('utf-8')
+    # The index is never exported; dropping a MultiIndex up front avoids the
+    # slow MultiIndex path in to_csv (pandas issue #59312)
+    if isinstance(df.index, pd.MultiIndex):
+        df = df.reset_index(drop=True)
+    
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES) as tmp:
+        try:
+            # Datetime/bool columns are written as pandas-formatted text
+            # (2021-03-15, +07:00 offsets, True/False) instead of Arrow's format
+            text_cols = {col: 'string' for col, dtype in df.dtypes.items() if dtype.kind in 'bM'}
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            for col in text_cols:
+                schema = schema.set(schema.get_field_index(col), pa.field(col, pa.string()))
+            
+            with pa_csv.CSVWriter(tmp, schema) as writer:
+                for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+                    chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS].astype(text_cols)
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        except pa.ArrowException:
+            tmp.seek(0)
+            tmp.truncate()
+            # max(..., 1) so an empty frame still gets its header row
+            for start in range(0, max(len(df), 1), EXPORT_CHUNK_ROWS):
+                chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+                tmp.write(chunk.to_csv(index=False, header=(start == 0)).encode('utf-8'))
+        
+        tmp.seek(0)
+        return tmp.read()
+
+
+def _arrow_rejects(series):
+    """True nếu cột không chuyển được sang Arrow (vd: giá trị lẫn số và chữ)"""
+    try:
+        pa.Array.from_pandas(series)
+    except pa.ArrowException:
+        return True
+    return False
+
+
+def _write_parquet(df, sink):
+    """Ghi df vào sink dưới dạng Parquet (zstd) theo từng khối EXPORT_CHUNK_ROWS dòng"""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(sink, schema, compression='zstd') as writer:
+        for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+            chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_key})
+def convert_df_to_parquet(df):
+    """
+    Convert dataframe to Parquet (zstd) for download
+    
+    Nhỏ hơn và đọc lại nhanh hơn nhiều so với CSV, giữ nguyên kiểu dữ liệu.
+    Các cột Arrow không chuyển được (object/category lẫn nhiều kiểu) được
+    ghi dưới dạng chuỗi.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES) as tmp:
+        try:
+            _write_parquet(df, tmp)
+        except pa.ArrowException:
+            tmp.seek(0)
+            tmp.truncate()
+            rejected_cols = [col for col in df.columns if _arrow_rejects(df[col])]
+            _write_parquet(df.astype({col: 'string' for col in rejected_cols}), tmp)
+        
+        tmp.seek(0)
+        return tmp.read()
 
 
 # ==================== MAIN APPLICATION ====================
@@ -411,6 +999,16 @@ def main():
             st.session_state.cleaning_stats = None
         if 'last_uploaded_file' not in st.session_state:
             st.session_state.last_uploaded_file = None
+        if 'missing_per_col_original' not in st.session_state:
+            st.session_state.missing_per_col_original = None
+        if 'missing_per_col_cleaned' not in st.session_state:
+            st.session_state.missing_per_col_cleaned = None
+        if 'quartiles_original' not in st.session_state:
+            st.session_state.quartiles_original = None
+        if 'quartiles_cleaned' not in st.session_state:
+            st.session_state.quartiles_cleaned = None
+        if 'df_version' not in st.session_state:
+            st.session_state.df_version = new_df_version()
         
         # Load data and auto-reset on new file
         if uploaded_file is not None:
@@ -420,19 +1018,28 @@ def main():
             if st.session_state.last_uploaded_file != current_file_name:
                 # New file detected - reset cleaned data
                 st.session_state.df_cleaned = None
+                st.session_state.df_version = new_df_version()
                 st.session_state.cleaning_stats = None
+                st.session_state.missing_per_col_cleaned = None
+                st.session_state.quartiles_cleaned = None
                 st.session_state.last_uploaded_file = current_file_name
                 
                 # Load the new file
                 df = load_data(uploaded_file)
                 if df is not None:
                     st.session_state.df_original = df
+                    st.session_state.df_version = new_df_version()
+                    st.session_state.missing_per_col_original = df.isna().sum()
+                    st.session_state.quartiles_original = column_quartiles(df)
                     st.success(f"✅ Đã tải {len(df)} dòng, {len(df.columns)} cột")
             elif st.session_state.df_original is None:
                 # First time loading
                 df = load_data(uploaded_file)
                 if df is not None:
                     st.session_state.df_original = df
+                    st.session_state.df_version = new_df_version()
+                    st.session_state.missing_per_col_original = df.isna().sum()
+                    st.session_state.quartiles_original = column_quartiles(df)
                     st.success(f"✅ Đã tải {len(df)} dòng, {len(df.columns)} cột")
         
         # Data cleaning options (only show if data is loaded)
@@ -458,9 +1065,9 @@ def main():
             st.divider()
             col1, col2 = st.columns(2)
             with col1:
-                clean_btn = st.button("🚀 Clean", type="primary", use_container_width=True)
+                clean_btn = st.button("🚀 Clean", type="primary", width='stretch')
             with col2:
-                reset_btn = st.button("🔄 Reset", type="secondary", use_container_width=True)
+                reset_btn = st.button("🔄 Reset", type="secondary", width='stretch')
             
             if clean_btn:
                 with st.spinner("Đang xử lý..."):
@@ -471,7 +1078,10 @@ def main():
                         convert_types=auto_convert
                     )
                     st.session_state.df_cleaned = df_cleaned
+                    st.session_state.df_version = new_df_version()
                     st.session_state.cleaning_stats = stats
+                    st.session_state.missing_per_col_cleaned = df_cleaned.isna().sum()
+                    st.session_state.quartiles_cleaned = column_quartiles(df_cleaned)
                     st.success("✅ Hoàn thành!")
                     
                     # Show warnings if any
@@ -481,7 +1091,10 @@ def main():
             
             if reset_btn:
                 st.session_state.df_cleaned = None
+                st.session_state.df_version = new_df_version()
                 st.session_state.cleaning_stats = None
+                st.session_state.missing_per_col_cleaned = None
+                st.session_state.quartiles_cleaned = None
                 st.success("✅ Đã reset về dữ liệu gốc!")
                 st.rerun()
     
@@ -522,6 +1135,13 @@ def main():
     # Get working dataframe
     df_work = st.session_state.df_cleaned if st.session_state.df_cleaned is not None else st.session_state.df_original
     
+    # Missing counts per column are computed once per dataframe (on load / clean)
+    missing_original = st.session_state.missing_per_col_original
+    missing_cleaned = st.session_state.missing_per_col_cleaned
+    missing_work = missing_cleaned if st.session_state.df_cleaned is not None else missing_original
+    quartiles_work = (st.session_state.quartiles_cleaned if st.session_state.df_cleaned is not None
+                      else st.session_state.quartiles_original) or {}
+    
     # Create tabs
     tab1, tab2, tab3, tab4 = st.tabs([
         "📋 Tổng quan dữ liệu",
@@ -534,6 +1154,9 @@ def main():
     with tab1:
         st.header("📋 Tổng quan dữ liệu")
         
+        # describe/info/memory are cached so unrelated widget reruns skip them
+        overview = compute_overview(df_work)
+        
         # Basic metrics
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -541,10 +1164,9 @@ def main():
         with col2:
             st.metric("Số cột", len(df_work.columns))
         with col3:
-            st.metric("Giá trị thiếu", f"{df_work.isnull().sum().sum():,}")
+            st.metric("Giá trị thiếu", f"{missing_work.sum():,}")
         with col4:
-            memory_mb = df_work.memory_usage(deep=True).sum() / 1024**2
-            st.metric("Bộ nhớ", f"{memory_mb:.2f} MB")
+            st.metric("Bộ nhớ", f"{overview['memory_mb']:.2f} MB")
         
         st.divider()
         
@@ -560,19 +1182,17 @@ def main():
         
         with col2:
             st.subheader("🔍 Thông tin chi tiết")
-            buffer = StringIO()
-            df_work.info(buf=buffer)
-            st.text(buffer.getvalue())
+            st.text(overview['info'])
         
         st.divider()
         
         # Data preview
         st.subheader("👀 Xem trước dữ liệu")
-        st.dataframe(df_work.head(20), use_container_width=True)
+        st.dataframe(df_work.head(20), width='stretch')
         
         # Basic statistics
         st.subheader("📈 Thống kê mô tả")
-        st.dataframe(df_work.describe(), use_container_width=True)
+        st.dataframe(overview['describe'], width='stretch')
     
     # ==================== TAB 2: DATA CLEANING ====================
     with tab2:
@@ -609,32 +1229,22 @@ def main():
                 st.subheader("📊 Trước khi làm sạch")
                 st.write(f"Dòng: {stats['original_rows']:,}")
                 st.write(f"Cột: {stats['original_cols']}")
-                st.write(f"Missing values: {st.session_state.df_original.isnull().sum().sum():,}")
+                st.write(f"Missing values: {missing_original.sum():,}")
                 
                 with st.expander("Xem chi tiết missing values"):
-                    missing_df = pd.DataFrame({
-                        'Column': st.session_state.df_original.columns,
-                        'Missing Count': st.session_state.df_original.isnull().sum().values,
-                        'Missing %': (st.session_state.df_original.isnull().sum().values / len(st.session_state.df_original) * 100).round(2)
-                    })
-                    missing_df = missing_df[missing_df['Missing Count'] > 0].sort_values('Missing Count', ascending=False)
-                    st.dataframe(missing_df, use_container_width=True)
+                    missing_df = missing_summary(missing_original, len(st.session_state.df_original))
+                    st.dataframe(missing_df, width='stretch')
             
             with col2:
                 st.subheader("✨ Sau khi làm sạch")
                 st.write(f"Dòng: {stats['final_rows']:,}")
                 st.write(f"Cột: {stats['final_cols']}")
-                st.write(f"Missing values: {st.session_state.df_cleaned.isnull().sum().sum():,}")
+                st.write(f"Missing values: {missing_cleaned.sum():,}")
                 
-                if st.session_state.df_cleaned.isnull().sum().sum() > 0:
+                if missing_cleaned.sum() > 0:
                     with st.expander("Xem chi tiết missing values"):
-                        missing_df = pd.DataFrame({
-                            'Column': st.session_state.df_cleaned.columns,
-                            'Missing Count': st.session_state.df_cleaned.isnull().sum().values,
-                            'Missing %': (st.session_state.df_cleaned.isnull().sum().values / len(st.session_state.df_cleaned) * 100).round(2)
-                        })
-                        missing_df = missing_df[missing_df['Missing Count'] > 0].sort_values('Missing Count', ascending=False)
-                        st.dataframe(missing_df, use_container_width=True)
+                        missing_df = missing_summary(missing_cleaned, len(st.session_state.df_cleaned))
+                        st.dataframe(missing_df, width='stretch')
         else:
             st.info("👈 Sử dụng sidebar để cấu hình và thực hiện làm sạch dữ liệu")
             
@@ -647,23 +1257,18 @@ def main():
                 st.metric("Dòng trùng lặp", duplicates)
             
             with col2:
-                missing = st.session_state.df_original.isnull().sum().sum()
-                st.metric("Giá trị thiếu", missing)
+                missing_total = missing_original.sum()
+                st.metric("Giá trị thiếu", missing_total)
             
             # Missing values detail
-            if missing > 0:
+            if missing_total > 0:
                 st.subheader("📊 Chi tiết giá trị thiếu")
-                missing_df = pd.DataFrame({
-                    'Column': st.session_state.df_original.columns,
-                    'Missing Count': st.session_state.df_original.isnull().sum().values,
-                    'Missing %': (st.session_state.df_original.isnull().sum().values / len(st.session_state.df_original) * 100).round(2)
-                })
-                missing_df = missing_df[missing_df['Missing Count'] > 0].sort_values('Missing Count', ascending=False)
+                missing_df = missing_summary(missing_original, len(st.session_state.df_original))
                 
                 fig = px.bar(missing_df, x='Column', y='Missing %',
                            title='Phần trăm giá trị thiếu theo cột',
                            template='plotly_white')
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, width='stretch')
     
     # ==================== TAB 3: VISUALIZATION ====================
     with tab3:
@@ -710,7 +1315,7 @@ def main():
         if st.button("🎨 Tạo biểu đồ", type="primary"):
             fig = create_visualization(df_work, chart_type, x_col, y_col, color_col)
             if fig:
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, width='stretch')
         
         st.divider()
         
@@ -721,32 +1326,28 @@ def main():
             if st.checkbox("Hiển thị Heatmap", value=False):
                 fig = create_correlation_heatmap(df_work)
                 if fig:
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(fig, width='stretch')
                     
                     # Show top correlations
                     numeric_df = df_work[col_types['numeric']]
-                    corr_matrix = numeric_df.corr()
+                    corr_matrix = compute_correlation_matrix(numeric_df)
                     
-                    # Get top positive correlations
-                    corr_pairs = []
-                    for i in range(len(corr_matrix.columns)):
-                        for j in range(i+1, len(corr_matrix.columns)):
-                            corr_pairs.append({
-                                'Column 1': corr_matrix.columns[i],
-                                'Column 2': corr_matrix.columns[j],
-                                'Correlation': corr_matrix.iloc[i, j]
-                            })
-                    
-                    corr_df = pd.DataFrame(corr_pairs).sort_values('Correlation', ascending=False, key=abs)
+                    # Get top positive correlations (upper triangle, without the diagonal)
+                    rows, cols = np.triu_indices(len(corr_matrix.columns), k=1)
+                    corr_df = pd.DataFrame({
+                        'Column 1': corr_matrix.columns[rows],
+                        'Column 2': corr_matrix.columns[cols],
+                        'Correlation': corr_matrix.to_numpy()[rows, cols]
+                    }).sort_values('Correlation', ascending=False, key=abs)
                     
                     col1, col2 = st.columns(2)
                     with col1:
                         st.write("**Top 5 tương quan dương:**")
-                        st.dataframe(corr_df.head(5), use_container_width=True)
+                        st.dataframe(corr_df.head(5), width='stretch')
                     
                     with col2:
                         st.write("**Top 5 tương quan âm:**")
-                        st.dataframe(corr_df.tail(5), use_container_width=True)
+                        st.dataframe(corr_df.tail(5), width='stretch')
     
     # ==================== TAB 4: ADVANCED STATISTICS ====================
     with tab4:
@@ -761,17 +1362,26 @@ def main():
             selected_col = st.selectbox("Chọn cột để phân tích outliers", options=numeric_cols)
             
             if st.button("🔎 Phát hiện Outliers", type="primary"):
-                outliers_df, stats = detect_outliers(df_work, selected_col)
+                st.session_state.outlier_column = selected_col
+                st.session_state.outlier_page_size = OUTLIER_PAGE_SIZE
+            
+            # Keep showing results across reruns (e.g. "Xem thêm") until the column changes
+            if st.session_state.get('outlier_column') == selected_col:
+                page_size = st.session_state.get('outlier_page_size', OUTLIER_PAGE_SIZE)
+                result = outlier_analysis(df_work, st.session_state.df_version, selected_col,
+                                          quartiles_work.get(selected_col))
                 
-                if outliers_df is not None and stats is not None:
+                if result is not None:
+                    stats = result.stats
+                    stats_text = result.text
                     col1, col2, col3 = st.columns(3)
                     
                     with col1:
-                        st.metric("Tổng số giá trị", f"{stats['total_values']:,}")
+                        st.metric("Tổng số giá trị", stats_text['total_values'])
                     with col2:
-                        st.metric("Số Outliers", f"{stats['outliers_count']:,}")
+                        st.metric("Số Outliers", stats_text['outliers_count'])
                     with col3:
-                        st.metric("Phần trăm", f"{stats['outliers_percentage']:.2f}%")
+                        st.metric("Phần trăm", stats_text['outliers_percentage'])
                     
                     st.divider()
                     
@@ -779,25 +1389,29 @@ def main():
                     col1, col2 = st.columns(2)
                     with col1:
                         st.write("**📊 Thống kê IQR:**")
-                        st.write(f"Q1 (25%): {stats['Q1']:.2f}")
-                        st.write(f"Q3 (75%): {stats['Q3']:.2f}")
-                        st.write(f"IQR: {stats['IQR']:.2f}")
+                        st.write(stats_text['Q1'])
+                        st.write(stats_text['Q3'])
+                        st.write(stats_text['IQR'])
                     
                     with col2:
                         st.write("**📏 Ngưỡng Outlier:**")
-                        st.write(f"Lower Bound: {stats['lower_bound']:.2f}")
-                        st.write(f"Upper Bound: {stats['upper_bound']:.2f}")
+                        st.write(stats_text['lower_bound'])
+                        st.write(stats_text['upper_bound'])
                     
                     # Boxplot
-                    fig = px.box(df_work, y=selected_col,
-                               title=f"Box Plot - {selected_col}",
-                               template='plotly_white')
-                    st.plotly_chart(fig, use_container_width=True)
+                    fig = create_outlier_boxplot(st.session_state.df_version, selected_col, stats, result.values)
+                    st.plotly_chart(fig, width='content', config=BOXPLOT_CONFIG)
                     
                     # Show outliers table
-                    if len(outliers_df) > 0:
+                    if result.count:
                         st.subheader("⚠️ Danh sách Outliers")
-                        st.dataframe(outliers_df, use_container_width=True)
+                        
+                        # Only the current page is taken from df_work and shipped to the browser
+                        page_df = outlier_rows(df_work, selected_col, result.positions[:page_size], stats)
+                        st.dataframe(page_df, width='stretch')
+                        if result.count > page_size:
+                            st.caption(f"Hiển thị {page_size:,} / {result.count:,} outliers")
+                            st.button("⬇️ Xem thêm", on_click=show_more_outliers)
                     else:
                         st.success("✅ Không phát hiện outliers trong cột này!")
         else:
@@ -812,24 +1426,37 @@ def main():
         
         with col1:
             st.write("**Xuất dữ liệu gốc:**")
-            csv_original = convert_df_to_csv(st.session_state.df_original)
+            # Callables defer the conversion to the moment the button is clicked;
+            # Streamlit runs each one on its own thread, so the original and
+            # cleaned exports already convert concurrently (no executor needed)
             st.download_button(
                 label="📥 Download Original Data (CSV)",
-                data=csv_original,
+                data=partial(convert_df_to_csv, st.session_state.df_original),
                 file_name='original_data.csv',
                 mime='text/csv'
             )
+            st.download_button(
+                label="📥 Download Original Data (Parquet)",
+                data=partial(convert_df_to_parquet, st.session_state.df_original),
+                file_name='original_data.parquet',
+                mime='application/octet-stream'
+            )
         
         with col2:
             if st.session_state.df_cleaned is not None:
                 st.write("**Xuất dữ liệu đã làm sạch:**")
-                csv_cleaned = convert_df_to_csv(st.session_state.df_cleaned)
                 st.download_button(
                     label="📥 Download Cleaned Data (CSV)",
-                    data=csv_cleaned,
+                    data=partial(convert_df_to_csv, st.session_state.df_cleaned),
                     file_name='cleaned_data.csv',
                     mime='text/csv'
                 )
+                st.download_button(
+                    label="📥 Download Cleaned Data (Parquet)",
+                    data=partial(convert_df_to_parquet, st.session_state.df_cleaned),
+                    file_name='cleaned_data.parquet',
+                    mime='application/octet-stream'
+                )
             else:
                 st.info("Chưa có dữ liệu đã làm sạch")
 